@@ -2,8 +2,11 @@ from flask import Flask, render_template, request, redirect, url_for
 from help_requests_db import (
     get_pending_requests, 
     mark_request_resolved, 
+    mark_requests_resolved,
     add_learned_answer, 
+    add_learned_answers,
     get_request_by_id,
+    get_requests_by_ids,
     check_timeout_requests,
     get_requests_by_status,
     get_request_history,
@@ -15,6 +18,8 @@ import requests
 import os
 from dotenv import load_dotenv
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from bson import ObjectId
 import logging
 
 # Configure logging
@@ -25,6 +30,15 @@ load_dotenv()
 
 app = Flask(__name__)
 
+AGENT_WEBHOOK_URL = 'http://localhost:5005/supervisor_answer'
+
+# Seconds to wait for the agent webhook to accept an answer (it queues the
+# reply and returns without waiting for the speech to finish)
+WEBHOOK_TIMEOUT_SECONDS = 10
+
+# Upper bound on concurrent webhook deliveries for bulk answers
+MAX_WEBHOOK_WORKERS = 8
+
 @app.template_filter('unique')
 def unique_filter(sequence):
     """Filter out duplicate items from a sequence"""
@@ -106,6 +120,40 @@ def view_learned_answers():
         logger.debug(f"Answer: {answer}")
     return render_template('learned_answers.html', answers=answers)
 
+def notify_agent(request_id, request_doc, answer):
+    """Send a supervisor answer to the agent webhook. Returns True on success"""
+    try:
+        # Ensure we have a valid session ID
+        session_id = request_doc.get('conversation_id')
+        if not session_id:
+            logger.warning(f"No conversation_id found for request {request_id}")
+            session_id = f"default_{request_id}"
+            
+        webhook_data = {
+            'session_id': session_id,
+            'answer': answer,
+            'request_id': request_id,
+            # The admin UI has already stored the learned answer
+            'learned_answer_saved': True
+        }
+        
+        logger.debug(f"Sending webhook with data: {webhook_data}")
+        
+        response = requests.post(
+            AGENT_WEBHOOK_URL,
+            json=webhook_data,
+            timeout=WEBHOOK_TIMEOUT_SECONDS
+        )
+        
+        if response.status_code != 200:
+            logger.error(f"Error notifying agent: {response.text}")
+            logger.error(f"Response status code: {response.status_code}")
+            return False
+        return True
+    except Exception as e:
+        logger.error(f"Error sending webhook: {str(e)}")
+        return False
+
 @app.route('/answer/<request_id>', methods=['POST'])
 def answer(request_id):
     logger.debug(f"Processing answer for request: {request_id}")
@@ -130,33 +178,80 @@ def answer(request_id):
     add_learned_answer(request_doc['question'], answer)
     
     # Notify agent via webhook
-    try:
-        # Ensure we have a valid session ID
-        session_id = request_doc.get('conversation_id')
-        if not session_id:
-            logger.warning(f"No conversation_id found for request {request_id}")
-            session_id = f"default_{request_id}"
-            
-        webhook_data = {
-            'session_id': session_id,
-            'answer': answer,
-            'request_id': request_id
-        }
-        
-        logger.debug(f"Sending webhook with data: {webhook_data}")
-        
-        response = requests.post(
-            'http://localhost:5005/supervisor_answer',
-            json=webhook_data
+    notify_agent(request_id, request_doc, answer)
+    
+    return redirect(url_for('view_requests', status='pending'))
+
+@app.route('/answers/bulk', methods=['POST'])
+def answer_bulk():
+    """Answer many pending requests at once.
+
+    Form fields are named ``answer_<request_id>``; blank answers are ignored.
+    Requests are resolved in one bulk_write, learned answers are saved in one
+    batch and the agent is notified concurrently.
+    """
+    submitted = {}
+    for field, value in request.form.items():
+        if field.startswith('answer_') and value.strip():
+            submitted[field[len('answer_'):]] = value.strip()
+    logger.debug(f"Processing bulk answers for {len(submitted)} requests")
+    
+    results = {}
+    valid_ids = [request_id for request_id in submitted if ObjectId.is_valid(request_id)]
+    for request_id in submitted:
+        if request_id not in valid_ids:
+            results[request_id] = {'question': None, 'status': 'invalid_id'}
+    
+    request_docs = get_requests_by_ids(valid_ids) if valid_ids else {}
+    
+    to_resolve = {}
+    for request_id in valid_ids:
+        request_doc = request_docs.get(request_id)
+        if not request_doc:
+            results[request_id] = {'question': None, 'status': 'not_found'}
+            continue
+        outcome = {'question': request_doc['question']}
+        time_left = get_time_left(request_doc)
+        if request_doc['status'] == 'unresolved' or (time_left is not None and time_left <= 0):
+            outcome['status'] = 'timed_out'
+        elif request_doc['status'] != 'pending':
+            outcome['status'] = 'already_' + request_doc['status']
+        else:
+            to_resolve[request_id] = submitted[request_id]
+            outcome['status'] = 'resolved'
+        results[request_id] = outcome
+    
+    resolved_ids = mark_requests_resolved(to_resolve) if to_resolve else set()
+    
+    # Requests that timed out or were answered elsewhere since we read them
+    lost_ids = [request_id for request_id in to_resolve if request_id not in resolved_ids]
+    if lost_ids:
+        current_docs = get_requests_by_ids(lost_ids)
+        for request_id in lost_ids:
+            current_doc = current_docs.get(request_id)
+            if current_doc and current_doc['status'] == 'resolved':
+                results[request_id]['status'] = 'already_resolved'
+            else:
+                results[request_id]['status'] = 'timed_out'
+            del to_resolve[request_id]
+    
+    if to_resolve:
+        add_learned_answers(
+            (request_docs[request_id]['question'], answer)
+            for request_id, answer in to_resolve.items()
         )
         
-        if response.status_code != 200:
-            logger.error(f"Error notifying agent: {response.text}")
-            logger.error(f"Response status code: {response.status_code}")
-    except Exception as e:
-        logger.error(f"Error sending webhook: {str(e)}")
+        workers = min(MAX_WEBHOOK_WORKERS, len(to_resolve))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                request_id: executor.submit(notify_agent, request_id, request_docs[request_id], answer)
+                for request_id, answer in to_resolve.items()
+            }
+            for request_id, future in futures.items():
+                results[request_id]['notified'] = future.result()
     
-    return redirect(url_for('view_requests', status='pending'))
+    logger.info(f"Bulk answered {len(to_resolve)} of {len(submitted)} submitted requests")
+    return render_template('bulk_results.html', results=results)
 
 if __name__ == '__main__':
     app.run(debug=True, port=5000) 
\ No newline at end of file
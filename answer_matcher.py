@@ -0,0 +1,163 @@
+import re
+import math
+import logging
+from collections import Counter
+from functools import lru_cache
+from rapidfuzz import process, fuzz
+
+logger = logging.getLogger(__name__)
+
+# Default scorer name, see SCORERS below
+DEFAULT_SCORER = "token_sort"
+
+# Number of normalized queries whose best match is remembered
+DEFAULT_CACHE_SIZE = 1024
+
+# Disfluencies that Deepgram transcripts often contain. Only sounds with no
+# meaning are listed; real words like "well" or "okay" are kept.
+FILLER_WORDS = {
+    "um", "umm", "uh", "uhh", "uhm", "er", "erm", "ah", "ahh",
+    "hmm", "hm", "mm", "mhm",
+}
+# Phrases that are only dropped when they stand alone between punctuation,
+# so "um, you know, what time" loses them but "do you know what time" does not
+FILLER_PHRASES = [
+    "you know",
+    "i mean",
+]
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+_FILLER_PHRASE_RE = re.compile(
+    r"(?:^|(?<=[,.;:!?]))\s*(?:" + "|".join(re.escape(p) for p in FILLER_PHRASES) + r")\s*(?=[,.;:!?]|$)"
+)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def lowercase(text):
+    return text.lower()
+
+def strip_punctuation(text):
+    # Drop apostrophes so "what's" and "whats" compare equal
+    return _PUNCTUATION_RE.sub(lambda m: "" if m.group() in "'’" else " ", text)
+
+def remove_filler_phrases(text):
+    # Must run before strip_punctuation, which removes the boundaries
+    return _FILLER_PHRASE_RE.sub(" ", text)
+
+def remove_filler_words(text):
+    return " ".join(word for word in text.split() if word not in FILLER_WORDS)
+
+def collapse_whitespace(text):
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+# Normalization steps applied in order; lowercase must run before filler removal
+DEFAULT_NORMALIZERS = (
+    lowercase,
+    remove_filler_phrases,
+    strip_punctuation,
+    remove_filler_words,
+    collapse_whitespace,
+)
+
+
+def normalize(text, normalizers=DEFAULT_NORMALIZERS):
+    """Run text through a normalization pipeline"""
+    for step in normalizers:
+        text = step(text)
+    return text
+
+
+@lru_cache(maxsize=4096)
+def _ngram_profile(text, n=3):
+    padded = f" {text} "
+    grams = Counter(padded[i:i + n] for i in range(max(1, len(padded) - n + 1)))
+    norm = math.sqrt(sum(count * count for count in grams.values()))
+    return grams, norm
+
+def ngram_cosine(s1, s2, *, processor=None, score_cutoff=None, **kwargs):
+    """Cosine similarity of character trigram counts, scaled to 0-100.
+
+    Follows the rapidfuzz scorer contract so it can be passed to process.extractOne:
+    scores below score_cutoff are reported as 0.
+    """
+    if processor:
+        s1, s2 = processor(s1), processor(s2)
+    grams1, norm1 = _ngram_profile(s1)
+    grams2, norm2 = _ngram_profile(s2)
+    if not norm1 or not norm2:
+        return 0.0
+    if len(grams1) > len(grams2):
+        grams1, grams2 = grams2, grams1
+    dot = sum(count * grams2[gram] for gram, count in grams1.items() if gram in grams2)
+    # Cap floating-point error so identical strings score exactly 100
+    score = min(100.0, 100.0 * dot / (norm1 * norm2))
+    if score_cutoff is not None and score < score_cutoff:
+        return 0.0
+    return score
+
+# Scorer name -> (scorer, default threshold 0-100). The scorers use different
+# scales, so each threshold was picked with benchmark_matcher.py to keep
+# precision at or above 0.9 on the built-in question set.
+SCORERS = {
+    "token_sort": (fuzz.token_sort_ratio, 65),
+    "token_set": (fuzz.token_set_ratio, 70),
+    "wratio": (fuzz.WRatio, 90),
+    "partial": (fuzz.partial_ratio, 80),
+    "ngram_cosine": (ngram_cosine, 55),
+}
+
+
+class AnswerMatcher:
+    """Finds the learned question that best matches a caller's question.
+
+    Both the query and the candidate questions are normalized before scoring.
+    The scorer is called with score_cutoff so rapidfuzz can skip candidates
+    that cannot reach the threshold, and the best match for each normalized
+    query is cached until the set of candidate questions changes.
+    """
+
+    def __init__(self, scorer=DEFAULT_SCORER, threshold=None,
+                 normalizers=DEFAULT_NORMALIZERS, cache_size=DEFAULT_CACHE_SIZE):
+        if scorer not in SCORERS:
+            raise ValueError(f"Unknown scorer '{scorer}', expected one of: {', '.join(SCORERS)}")
+        self.scorer_name = scorer
+        self.scorer, default_threshold = SCORERS[scorer]
+        # Fall back to the scorer's own threshold when none is given
+        self.threshold = default_threshold if threshold is None else threshold
+        self.normalizers = tuple(normalizers)
+        self._normalize = lru_cache(maxsize=cache_size * 4)(self._normalize_uncached)
+        self._best_match = lru_cache(maxsize=cache_size)(self._best_match_uncached)
+
+    def _normalize_uncached(self, text):
+        return normalize(text, self.normalizers)
+
+    def _best_match_uncached(self, query, choices, score_cutoff):
+        result = process.extractOne(
+            query,
+            choices,
+            scorer=self.scorer,
+            score_cutoff=score_cutoff
+        )
+        if result is None:
+            return None
+        _, score, idx = result
+        return idx, score
+
+    def match(self, question, choices, threshold=None):
+        """Return (index, score) of the best match in choices, or None below threshold"""
+        if not choices:
+            return None
+        query = self._normalize(question)
+        if not query:
+            return None
+        normalized_choices = tuple(self._normalize(choice) for choice in choices)
+        score_cutoff = self.threshold if threshold is None else threshold
+        result = self._best_match(query, normalized_choices, score_cutoff)
+        logger.debug(f"Fuzzy match ({self.scorer_name}) result: {result} for question: {question}")
+        return result
+
+    def clear_cache(self):
+        """Drop cached normalizations, matches and n-gram profiles"""
+        self._normalize.cache_clear()
+        self._best_match.cache_clear()
+        _ngram_profile.cache_clear()
@@ -0,0 +1,155 @@
+"""Offline benchmark for the learned-answer matcher.
+
+Scores every probe question against a set of learned questions with each
+scorer and reports latency and precision/recall, so the scorer and threshold
+(FUZZY_MATCH_SCORER / FUZZY_MATCH_THRESHOLD) can be chosen on data rather
+than by feel. Without --thresholds each scorer runs at its own default.
+
+Usage:
+    python benchmark_matcher.py
+    python benchmark_matcher.py --thresholds 55 65 75 --repeat 20
+    python benchmark_matcher.py --data my_questions.json
+
+A custom data file is JSON of the form:
+    {"learned": ["question", ...],
+     "probes": [{"query": "...", "expected": <index into learned or null>}, ...]}
+"""
+import argparse
+import json
+import statistics
+import time
+
+from answer_matcher import AnswerMatcher, SCORERS
+
+LEARNED_QUESTIONS = [
+    "What are your opening hours?",
+    "Do you take walk-ins?",
+    "How much is a women's haircut?",
+    "How much is a men's haircut?",
+    "Do you offer hair coloring?",
+    "How much does balayage cost?",
+    "Do you do manicures and pedicures?",
+    "Where are you located?",
+    "Is there parking available?",
+    "Can I cancel my appointment?",
+    "Do you sell hair products?",
+    "Do you offer gift cards?",
+    "Do you do bridal hair and makeup?",
+    "What forms of payment do you accept?",
+    "Do you do keratin treatments?",
+]
+
+# expected is the index of the learned question that should match, or None
+PROBES = [
+    {"query": "um what are your opening hours", "expected": 0},
+    {"query": "What time do you open?", "expected": 0},
+    {"query": "uh what are the hours you're open", "expected": 0},
+    {"query": "do you guys take walk ins", "expected": 1},
+    {"query": "Can I just walk in?", "expected": 1},
+    {"query": "how much is a haircut for women", "expected": 2},
+    {"query": "What does a woman's haircut cost?", "expected": 2},
+    {"query": "how much for a mens haircut", "expected": 3},
+    {"query": "you know do you do hair colouring", "expected": 4},
+    {"query": "You know, do you do hair colouring?", "expected": 4},
+    {"query": "Do you color hair?", "expected": 4},
+    {"query": "what's the cost of balayage", "expected": 5},
+    {"query": "So, um, how much is balayage?", "expected": 5},
+    {"query": "do you do manicures", "expected": 6},
+    {"query": "Do you guys do pedicures and manicures?", "expected": 6},
+    {"query": "where are you located exactly", "expected": 7},
+    {"query": "What's your address?", "expected": 7},
+    {"query": "is there any parking", "expected": 8},
+    {"query": "I need to cancel my appointment", "expected": 9},
+    {"query": "uh can I cancel an appointment", "expected": 9},
+    {"query": "do you sell any hair products", "expected": 10},
+    {"query": "Can I buy a gift card?", "expected": 11},
+    {"query": "do you do bridal makeup and hair", "expected": 12},
+    {"query": "Which payment methods do you accept?", "expected": 13},
+    {"query": "do you accept credit cards", "expected": 13},
+    {"query": "Do you do keratin treatment?", "expected": 14},
+    {"query": "Do you do eyelash extensions?", "expected": None},
+    {"query": "Can I bring my dog?", "expected": None},
+    {"query": "Do you do tattoos?", "expected": None},
+    {"query": "Is the stylist Maria working today?", "expected": None},
+    {"query": "How long does a perm take?", "expected": None},
+    {"query": "Do you have wifi?", "expected": None},
+    {"query": "Do you do beard trims?", "expected": None},
+    {"query": "um hi", "expected": None},
+]
+
+
+def load_dataset(path):
+    if not path:
+        return LEARNED_QUESTIONS, PROBES
+    with open(path) as f:
+        data = json.load(f)
+    return data["learned"], data["probes"]
+
+def evaluate(scorer, threshold, learned, probes, repeat):
+    """Return latency and accuracy figures for one scorer/threshold pair"""
+    # Disable the result cache so every repeat measures real scoring work
+    matcher = AnswerMatcher(scorer=scorer, threshold=threshold, cache_size=0)
+
+    latencies = []
+    predictions = []
+    for probe in probes:
+        result = matcher.match(probe["query"], learned)
+        predictions.append(result[0] if result else None)
+        for _ in range(repeat):
+            # Also drops the shared n-gram profile cache so ngram_cosine is
+            # timed from scratch like the rapidfuzz scorers
+            matcher.clear_cache()
+            start = time.perf_counter()
+            matcher.match(probe["query"], learned)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    true_positives = sum(
+        1 for probe, predicted in zip(probes, predictions)
+        if predicted is not None and predicted == probe["expected"]
+    )
+    predicted_matches = sum(1 for predicted in predictions if predicted is not None)
+    positives = sum(1 for probe in probes if probe["expected"] is not None)
+
+    precision = true_positives / predicted_matches if predicted_matches else 0.0
+    recall = true_positives / positives if positives else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    # quantiles needs at least two samples
+    p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0]
+    return {
+        "scorer": scorer,
+        "threshold": threshold,
+        "mean_ms": statistics.mean(latencies),
+        "p95_ms": p95,
+        "precision": precision,
+        "recall": recall,
+        "f1": f1,
+    }
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark learned-answer matcher scorers")
+    parser.add_argument("--data", help="JSON file with learned questions and labeled probes")
+    parser.add_argument("--scorers", nargs="+", default=list(SCORERS), choices=list(SCORERS))
+    parser.add_argument("--thresholds", nargs="+", type=float,
+                        help="Thresholds to try (default: each scorer's own threshold)")
+    parser.add_argument("--repeat", type=positive_int, default=10, help="Timed runs per probe")
+    args = parser.parse_args()
+
+    learned, probes = load_dataset(args.data)
+    print(f"{len(learned)} learned questions, {len(probes)} probes, {args.repeat} runs each\n")
+    print(f"{'scorer':<14}{'thresh':>7}{'mean ms':>10}{'p95 ms':>10}{'prec':>7}{'recall':>8}{'f1':>7}")
+    for scorer in args.scorers:
+        for threshold in args.thresholds or [SCORERS[scorer][1]]:
+            row = evaluate(scorer, threshold, learned, probes, args.repeat)
+            print(
+                f"{row['scorer']:<14}{row['threshold']:>7g}{row['mean_ms']:>10.3f}{row['p95_ms']:>10.3f}"
+                f"{row['precision']:>7.2f}{row['recall']:>8.2f}{row['f1']:>7.2f}"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,8 @@ from dotenv import load_dotenv
 import os
 from bson import ObjectId
 import logging
-from rapidfuzz import process, fuzz
+from answer_matcher import AnswerMatcher, SCORERS, DEFAULT_SCORER
+from pymongo import UpdateOne, InsertOne
 
 # Configure logging
 # logging.basicConfig(level=logging.DEBUG)
@@ -23,8 +24,27 @@ LEARNED_ANSWERS_COLLECTION = "learned_answers"
 # Request timeout in minutes
 REQUEST_TIMEOUT_MINUTES = 2
 
-# Fuzzy matching threshold (0-100)
-FUZZY_MATCH_THRESHOLD = 65
+# Fuzzy matching scorer: token_sort, token_set, wratio, partial or ngram_cosine
+# (run benchmark_matcher.py to compare them)
+FUZZY_MATCH_SCORER = os.getenv("FUZZY_MATCH_SCORER", "").strip().lower() or DEFAULT_SCORER
+if FUZZY_MATCH_SCORER not in SCORERS:
+    logger.error(
+        f"Unknown FUZZY_MATCH_SCORER '{FUZZY_MATCH_SCORER}', expected one of: "
+        f"{', '.join(SCORERS)}; using {DEFAULT_SCORER}"
+    )
+    FUZZY_MATCH_SCORER = DEFAULT_SCORER
+
+# Fuzzy matching threshold (0-100). Leave unset to use the scorer's own
+# default, since the scorers do not share a scale.
+FUZZY_MATCH_THRESHOLD = None
+_threshold_setting = os.getenv("FUZZY_MATCH_THRESHOLD", "").strip()
+if _threshold_setting:
+    try:
+        FUZZY_MATCH_THRESHOLD = float(_threshold_setting)
+    except ValueError:
+        logger.error(f"Invalid FUZZY_MATCH_THRESHOLD '{_threshold_setting}', using the scorer default")
+
+learned_answer_matcher = AnswerMatcher(scorer=FUZZY_MATCH_SCORER, threshold=FUZZY_MATCH_THRESHOLD)
 
 # Create a new client and connect to the server using ServerApi
 client = MongoClient(MONGO_URI, server_api=ServerApi('1'))
@@ -93,6 +113,51 @@ def mark_request_resolved(request_id, answer):
     )
     logger.info(f"Marked request {request_id} as resolved")
 
+def mark_requests_resolved(answers):
+    """Resolve many requests in a single bulk_write.
+
+    `answers` maps request_id -> answer. Only requests that are still pending
+    and not past their timeout are updated. Returns the set of request ids
+    that this call actually resolved.
+    """
+    if not answers:
+        return set()
+    now = datetime.utcnow().isoformat()
+    operations = [
+        UpdateOne(
+            {
+                "_id": ObjectId(request_id),
+                "status": "pending",
+                "timeout_at": {"$gt": now}
+            },
+            {"$set": {
+                "status": "resolved",
+                "answer": answer,
+                "resolved_at": now,
+                "notified": False
+            }}
+        )
+        for request_id, answer in answers.items()
+    ]
+    result = help_requests.bulk_write(operations, ordered=False)
+    if result.modified_count == len(operations):
+        resolved_ids = set(answers)
+    elif not result.modified_count:
+        resolved_ids = set()
+    else:
+        # Some rows changed status since they were read; keep the ones that
+        # now carry exactly the answer and timestamp this call wrote
+        resolved_ids = {
+            str(doc["_id"])
+            for doc in help_requests.find(
+                {"_id": {"$in": [ObjectId(request_id) for request_id in answers]}, "resolved_at": now},
+                {"_id": 1, "status": 1, "answer": 1}
+            )
+            if doc["status"] == "resolved" and doc["answer"] == answers[str(doc["_id"])]
+        }
+    logger.info(f"Bulk resolved {len(resolved_ids)} of {len(operations)} requests")
+    return resolved_ids
+
 def mark_request_unresolved(request_id, reason=None):
     """Mark a request as unresolved with optional reason"""
     update_data = {
@@ -119,6 +184,12 @@ def mark_request_notified(request_id):
 def get_request_by_id(request_id):
     return help_requests.find_one({"_id": ObjectId(request_id)})
 
+def get_requests_by_ids(request_ids):
+    """Get many requests in one query, keyed by their string id"""
+    object_ids = [ObjectId(request_id) for request_id in request_ids]
+    docs = help_requests.find({"_id": {"$in": object_ids}})
+    return {str(doc["_id"]): doc for doc in docs}
+
 def add_learned_answer(question, answer):
     """Add a learned answer if it doesn't already exist"""
     # Check if we already have this question
@@ -143,25 +214,62 @@ def add_learned_answer(question, answer):
         })
         logger.info(f"Added new learned answer for question: {question}")
 
+def add_learned_answers(pairs):
+    """Add or update many learned answers with one read and one bulk_write.
+
+    `pairs` is an iterable of (question, answer). Mirrors add_learned_answer:
+    unchanged answers are left alone, changed ones are updated and new
+    questions are inserted. If a question appears more than once the last
+    answer wins.
+    """
+    latest = {}
+    for question, answer in pairs:
+        latest[question] = answer
+    if not latest:
+        return 0
+
+    existing = {
+        doc['question']: doc['answer']
+        for doc in learned_answers.find(
+            {"question": {"$in": list(latest)}},
+            {"question": 1, "answer": 1}
+        )
+    }
+
+    added_at = datetime.utcnow().isoformat()
+    operations = []
+    for question, answer in latest.items():
+        if question not in existing:
+            operations.append(InsertOne({
+                "question": question,
+                "answer": answer,
+                "added_at": added_at
+            }))
+        elif existing[question] != answer:
+            operations.append(UpdateOne(
+                {"question": question},
+                {"$set": {"answer": answer, "added_at": added_at}}
+            ))
+
+    if not operations:
+        return 0
+    learned_answers.bulk_write(operations, ordered=False)
+    logger.info(f"Bulk saved {len(operations)} learned answers")
+    return len(operations)
+
 def get_fuzzy_learned_answer(question, threshold=FUZZY_MATCH_THRESHOLD):
     """Get a learned answer using fuzzy matching"""
-    all_answers = list(learned_answers.find({}))
+    all_answers = list(learned_answers.find({}, {"question": 1, "answer": 1}))
     if not all_answers:
         return None
         
     # Extract questions for matching
     questions = [qa['question'] for qa in all_answers]
     
-    # Find the best match using token sort ratio (handles word order changes)
-    match, score, idx = process.extractOne(
-        question, 
-        questions, 
-        scorer=fuzz.token_sort_ratio
-    )
-    
-    logger.debug(f"Fuzzy match score: {score} for question: {question}")
-    
-    if score >= threshold:
+    # Find the best match on normalized text, skipping candidates below threshold
+    match = learned_answer_matcher.match(question, questions, threshold=threshold)
+    if match:
+        idx, score = match
         matched_answer = all_answers[idx]
         logger.info(f"Found fuzzy match (score: {score}): {matched_answer['question']}")
         return matched_answer['answer']
@@ -17,6 +17,16 @@ logger = logging.getLogger(__name__)
 # Global variable to store the active session
 active_session: AgentSession = None
 
+# Keep references to queued replies so they are not garbage collected mid-speech
+pending_replies = set()
+
+async def speak_answer(request_id, formatted_response):
+    try:
+        await active_session.say(formatted_response)
+        logger.info(f"Successfully generated reply for request {request_id}")
+    except Exception as e:
+        logger.error(f"Error generating reply for request {request_id}: {str(e)}")
+
 async def supervisor_answer(request):
     try:
         data = await request.json()
@@ -41,25 +51,23 @@ async def supervisor_answer(request):
             logger.warning(f"Attempted to answer timed out request: {request_id}")
             return web.Response(status=400, text="This request has timed out")
             
-        # Add to learned answers
-        add_learned_answer(request_doc["question"], answer)
+        # Add to learned answers unless the caller (e.g. the admin UI) already did
+        if not data.get("learned_answer_saved"):
+            add_learned_answer(request_doc["question"], answer)
         
         # Mark request as notified
         mark_request_notified(request_id)
         
-        # If we have an active session, generate a reply with the answer
+        # If we have an active session, queue the reply and return once it is accepted;
+        # waiting for playback would hold the caller while earlier answers are spoken
         if active_session and isinstance(active_session, AgentSession):
-            try:
-                # Format the response to be more natural
-                formatted_response = f"I've checked with my supervisor. {answer}"
-                logger.info(f"Sending formatted response: {formatted_response}")
-                
-                # Use the session's generate_reply method
-                await active_session.say(formatted_response)
-                logger.info(f"Successfully generated reply for request {request_id}")
-            except Exception as e:
-                logger.error(f"Error generating reply: {str(e)}")
-                return web.Response(status=500, text=f"Error generating reply: {str(e)}")
+            # Format the response to be more natural
+            formatted_response = f"I've checked with my supervisor. {answer}"
+            logger.info(f"Sending formatted response: {formatted_response}")
+            
+            task = asyncio.create_task(speak_answer(request_id, formatted_response))
+            pending_replies.add(task)
+            task.add_done_callback(pending_replies.discard)
         else:
             error_msg = f"No valid LiveKit session found. Active session: {type(active_session)}"
             logger.error(error_msg)